@@ -3,11 +3,17 @@ echo Installing requirements...
 pip install -r requirements.txt
 pip install pyinstaller
 
+if not exist hand_landmarker.task (
+    echo Downloading hand landmarker model...
+    curl -L -o hand_landmarker.task https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/1/hand_landmarker.task
+)
+
 echo Building application...
 pyinstaller --name="GestureControl" ^
             --windowed ^
             --icon=hand_icon.ico ^
             --add-data="hand_icon.ico;." ^
+            --add-data="hand_landmarker.task;." ^
             --hidden-import=pystray._win32 ^
             --hidden-import=PIL ^
             --hidden-import=mediapipe ^
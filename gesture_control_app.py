@@ -1,66 +1,444 @@
 import cv2
-import mediapipe as mp
 import pyautogui
 import time
 import sys
 import threading
+import urllib.request
+import shutil
 from pathlib import Path
 import os
 import numpy as np
 
-# For system tray functionality
+# psutil is only used to raise the process priority
 try:
-    import pystray
-    from PIL import Image, ImageDraw
-    HAS_TRAY = True
+    import psutil
+    HAS_PSUTIL = True
 except ImportError:
-    print("pystray and/or PIL not found. Installing system tray dependencies...")
-    import subprocess
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "pystray", "pillow"])
-    import pystray
-    from PIL import Image, ImageDraw
-    HAS_TRAY = True
+    HAS_PSUTIL = False
+
+HAND_MODEL_PATH = 'hand_landmarker.task'
+HAND_MODEL_URL = ('https://storage.googleapis.com/mediapipe-models/hand_landmarker/'
+                  'hand_landmarker/float16/1/hand_landmarker.task')
+
+# For system tray functionality. pystray and PIL are imported by
+# load_tray_modules() on the tray thread, not at startup.
+HAS_TRAY = True
+
+def load_tray_modules():
+    try:
+        import pystray
+        from PIL import Image, ImageDraw
+    except ImportError:
+        print("pystray and/or PIL not found. Installing system tray dependencies...")
+        import subprocess
+        subprocess.check_call([sys.executable, "-m", "pip", "install", "pystray", "pillow"])
+        import pystray
+        from PIL import Image, ImageDraw
+    return pystray, Image, ImageDraw
+
+def pin_current_thread(core):
+    # Keep the calling thread on one core so its working set stays in that core's cache
+    try:
+        if sys.platform.startswith('linux'):
+            # On Linux pid 0 means the calling thread
+            os.sched_setaffinity(0, {core})
+        elif sys.platform == 'win32':
+            import ctypes
+            from ctypes import wintypes
+            
+            # The mask is pointer sized; it only covers the first 64 cores
+            if core >= ctypes.sizeof(ctypes.c_size_t) * 8:
+                return
+            
+            kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+            kernel32.GetCurrentThread.restype = wintypes.HANDLE
+            kernel32.SetThreadAffinityMask.argtypes = (wintypes.HANDLE, ctypes.c_size_t)
+            kernel32.SetThreadAffinityMask.restype = ctypes.c_size_t
+            if not kernel32.SetThreadAffinityMask(kernel32.GetCurrentThread(), 1 << core):
+                raise ctypes.WinError(ctypes.get_last_error())
+    except OSError as e:
+        print(f"Could not pin capture thread to core {core}: {e}")
+
+class CaptureThread(threading.Thread):
+    def __init__(self, cap):
+        super().__init__(daemon=True)
+        self.cap = cap
+        self.running = True
+
+        # Two pre-allocated buffers: the thread decodes into the back one and
+        # swaps it to the front, so the consumer always gets the newest frame
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or 640
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or 480
+        self._front = np.zeros((height, width, 3), dtype=np.uint8)
+        self._back = np.zeros((height, width, 3), dtype=np.uint8)
+        self._lock = threading.Lock()
+        self.new_frame = threading.Event()
+
+    def run(self):
+        # Keep capture on the last core, away from the main loop
+        cpu_count = os.cpu_count() or 1
+        if cpu_count > 1:
+            pin_current_thread(cpu_count - 1)
+
+        while self.running and self.cap.isOpened():
+            ok, frame = self._latest_frame()
+            if not ok:
+                time.sleep(0.01)
+                continue
+
+            # retrieve() may hand back a new array if the frame size changed
+            self._back = frame
+            # Signal under the lock, so a read() can't take this frame and
+            # clear the event before it is set, and then read it again
+            with self._lock:
+                self._front, self._back = self._back, self._front
+                self.new_frame.set()
+
+    def _latest_frame(self, max_skip=3, fresh_grab_time=0.005):
+        # grab() only advances the stream without decoding, so skip any frames
+        # already sitting in the driver buffer. Buffered frames come back
+        # instantly; a grab that has to wait means we reached a fresh one.
+        grabbed = False
+        for _ in range(max_skip):
+            t0 = time.perf_counter()
+            if not self.cap.grab():
+                break
+            grabbed = True
+            if time.perf_counter() - t0 > fresh_grab_time:
+                break
+
+        if not grabbed:
+            return False, None
+
+        # Decode only the frame we are going to use
+        return self.cap.retrieve(self._back)
+
+    def read(self, dst=None, timeout=0.1):
+        # Wait for a frame newer than the last one we returned
+        if not self.new_frame.wait(timeout):
+            return False, None
+
+        with self._lock:
+            self.new_frame.clear()
+            # Mirror the frame for the selfie view straight into dst, which
+            # is also the copy that frees the capture thread's buffers
+            return True, cv2.flip(self._front, 1, dst=dst)
+
+    def stop(self):
+        self.running = False
+
+# Landmark indices from MediaPipe's HandLandmark enum as plain ints, so
+# per-frame code doesn't go through the enum on every lookup. They live at
+# module level so the Numba kernels below can use them as compile-time
+# constants, and are spelled out so importing this module doesn't load MediaPipe.
+THUMB_TIP = 4
+THUMB_IP = 3
+INDEX_FINGER_TIP = 8
+INDEX_FINGER_PIP = 6
+MIDDLE_FINGER_TIP = 12
+MIDDLE_FINGER_PIP = 10
+RING_FINGER_TIP = 16
+RING_FINGER_PIP = 14
+PINKY_TIP = 20
+PINKY_PIP = 18
+
+# The gesture classifiers below are compiled to native code with Numba by
+# compile_gesture_kernels() once the camera is starting; until then, or
+# without Numba, they run as plain Python
+
+# Gesture ids returned by the classifiers
+GESTURE_NONE = 0
+GESTURE_MOUSE = 1
+GESTURE_SCROLL_VERTICAL = 2
+GESTURE_SCROLL_HORIZONTAL = 3
+GESTURE_LEFT_CLICK = 4
+GESTURE_RIGHT_CLICK = 5
+GESTURE_SELECT = 6
+GESTURE_ZOOM = 7
+
+def fingers_extended(pts):
+    # A finger is extended when its tip is above the joint below it
+    return (pts[THUMB_TIP, 1] < pts[THUMB_IP, 1],
+            pts[INDEX_FINGER_TIP, 1] < pts[INDEX_FINGER_PIP, 1],
+            pts[MIDDLE_FINGER_TIP, 1] < pts[MIDDLE_FINGER_PIP, 1],
+            pts[RING_FINGER_TIP, 1] < pts[RING_FINGER_PIP, 1],
+            pts[PINKY_TIP, 1] < pts[PINKY_PIP, 1])
+
+def classify_one_hand(pts):
+    # pts is a (21, 2) array of normalized (x, y) landmarks.
+    # Returns (gesture id, gesture parameter).
+    thumb, index, middle, ring, little = fingers_extended(pts)
+    
+    # Mouse control with index finger
+    if index and not (middle or ring or little):
+        return GESTURE_MOUSE, 0.0
+    
+    # Vertical scrolling with index and middle fingers, by hand height
+    if index and middle and not (ring or little):
+        return GESTURE_SCROLL_VERTICAL, (pts[INDEX_FINGER_TIP, 1] + pts[MIDDLE_FINGER_TIP, 1]) / 2
+    
+    # Horizontal scrolling with index and little fingers, by hand position
+    if index and little and not (middle or ring):
+        return GESTURE_SCROLL_HORIZONTAL, (pts[INDEX_FINGER_TIP, 0] + pts[PINKY_TIP, 0]) / 2
+    
+    # Left click with open hand
+    if thumb and index and middle and ring and little:
+        return GESTURE_LEFT_CLICK, 0.0
+    
+    # Right click with thumb and middle finger pinch
+    dx = pts[THUMB_TIP, 0] - pts[MIDDLE_FINGER_TIP, 0]
+    dy = pts[THUMB_TIP, 1] - pts[MIDDLE_FINGER_TIP, 1]
+    if (dx * dx + dy * dy) ** 0.5 < 0.05:
+        return GESTURE_RIGHT_CLICK, 0.0
+    
+    return GESTURE_NONE, 0.0
+
+def classify_two_hands(pts1, pts2):
+    thumb1, index1, middle1, ring1, little1 = fingers_extended(pts1)
+    _, index2, middle2, ring2, little2 = fingers_extended(pts2)
+    hand1_open = thumb1 and index1 and middle1 and ring1 and little1
+    
+    # Text selection - open palm and index finger pointing
+    if hand1_open and index2 and not (middle2 or ring2 or little2):
+        return GESTURE_SELECT, 0.0
+    
+    # Zoom - open palm and peace sign, by height of the two fingers
+    if hand1_open and index2 and middle2 and not (ring2 or little2):
+        return GESTURE_ZOOM, (pts2[INDEX_FINGER_TIP, 1] + pts2[MIDDLE_FINGER_TIP, 1]) / 2
+    
+    return GESTURE_NONE, 0.0
+
+def compile_gesture_kernels():
+    # Numba and llvmlite take a while to import, so they are only loaded
+    # here, after startup, rather than with this module
+    global fingers_extended, classify_one_hand, classify_two_hands
+    try:
+        from numba import njit
+    except ImportError:
+        return
+    
+    # fingers_extended is compiled first so the classifiers call its native version
+    jit = njit(cache=True, fastmath=True)
+    fingers_extended = jit(fingers_extended)
+    classify_one_hand = jit(classify_one_hand)
+    classify_two_hands = jit(classify_two_hands)
+    
+    # Numba compiles on the first call; do it now (or load it from the
+    # cache) rather than freezing the first time a hand shows up
+    warm_up = np.zeros((21, 2), dtype=np.float32)
+    classify_one_hand(warm_up)
+    classify_two_hands(warm_up, warm_up)
 
 class GestureControlApp:
+    # Finger tips (thumb to little finger) and the joints below them that
+    # decide whether each finger is extended
+    TIPS = np.array([THUMB_TIP, INDEX_FINGER_TIP, MIDDLE_FINGER_TIP, RING_FINGER_TIP, PINKY_TIP])
+    PIPS = np.array([THUMB_IP, INDEX_FINGER_PIP, MIDDLE_FINGER_PIP, RING_FINGER_PIP, PINKY_PIP])
+
     def __init__(self):
         self.running = False
         self.paused = False
         
-        # MediaPipe setup
-        self.mp_hands = mp.solutions.hands
-        self.mp_drawing = mp.solutions.drawing_utils
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=2,
-            min_detection_confidence=0.8,
-            min_tracking_confidence=0.5
-        )
+        # MediaPipe setup. MediaPipe itself is loaded on first use of self.hands
+        self.mp = None
+        self._landmarkers = None
+        self.TWO_HAND_TIMEOUT = 3.0  # Seconds without a second hand before tracking one again
+        self.TWO_HAND_PROBE_INTERVAL = 10  # Tracked frames between looks for a second hand
+        self.MOTION_THRESHOLD = 0.02  # Hand movement between results that forces tracking every frame
+        self.RESULT_MAX_AGE = 0.2  # Seconds after which a result is too old to act on
+        self.CAPTURE_TIMEOUT = 3.0  # Seconds without a camera frame before reporting a failure
+        self._last_frame_time = 0.0
+        self._capture_failed = False
+        
+        # Latest landmarks delivered by the hand landmarker callback, as a
+        # (hands, 21, 2) array of normalized (x, y) points
+        self._result_lock = threading.Lock()
+        self._last_result = np.zeros((0, 21, 2), dtype=np.float32)
+        self._last_result_time = 0
+        self._last_timestamp = 0
+        self._small_buf = None
+        self._frame_buf = None
+        
+        # How far the hand moved between the last two results, used to skip
+        # tracking on alternate frames while it holds still
+        self._last_centroid = None
+        self._hand_motion = 0.0
+        
+        # Track a single hand until a two hand gesture looks likely
+        self.num_hands = 1
+        self._two_hand_window = 0.0
+        self._track_count = 0
+        # Timestamp of the last frame sent before switching to two hands, and
+        # whether the result being handled is still from before the switch
+        self._two_hand_switch_time = 0
+        self._switching_hands = False
+        self.model_path = resource_path(HAND_MODEL_PATH)
+        if not ensure_hand_model(self.model_path):
+            sys.exit(1)
         
         # Constants
         self.SCROLL_SPEED = 50
         self.CLICK_COOLDOWN = 0.5
+        self.ZOOM_COOLDOWN = 0.15
+        self.SCROLL_COOLDOWN = 0.1
+        self.INFERENCE_SIZE = (256, 256)  # Palm detector input size
+        self.CAMERA_WIDTH = 640
+        self.CAMERA_HEIGHT = 480
+        self.CAMERA_FPS = 30
+        self.CURSOR_SMOOTHING = 0.6  # Weight kept from the previous cursor position
         self.last_click_time = time.time()
+        self._last_zoom_time = 0.0
+        self._last_scroll_time = 0.0
         self.screen_width, self.screen_height = pyautogui.size()
         
         # Status messages
         self.status_message = "Gesture Control Ready"
         self.mode_message = "No hands detected"
         
+        # Rendering state: the window is redrawn every other frame or when the
+        # status changes, and the guide lines are drawn once into an overlay
+        self._frame_idx = 0
+        self._last_status = None
+        self._overlay = None
+        self._overlay_mask = None
+        
+        # Nothing is drawn while the window is hidden to the tray
+        self.WINDOW_NAME = 'Gesture Control'
+        self._window_visible = True
+        self._window_open = False
+        
+        # Set once the tray icon is running, so the window can be hidden to it
+        self._tray_ready = False
+        
+        # The paused screen never changes, so build it once
+        self._paused_img = 255 * np.ones((400, 600, 3), dtype=np.uint8)
+        cv2.putText(self._paused_img, "PAUSED", (200, 200), cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 0, 255), 3)
+        cv2.putText(self._paused_img, "Press 'P' to resume", (150, 250), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+        
+        # Smoothed cursor position, reset while no single hand is tracked
+        self._cursor_ema = None
+        
         # For text selection
         self.selection_active = False
         self.selection_start = None
         
+        # PyAutoGUI sleeps 0.1 s after every call by default, which would
+        # stall the main loop on each cursor move. Scrolling relied on that
+        # sleep as a rate limit and uses SCROLL_COOLDOWN instead.
+        pyautogui.PAUSE = 0
+        
         # If running as a bundled app, disable PyAutoGUI failsafe
         if getattr(sys, 'frozen', False):
             pyautogui.FAILSAFE = False
 
+    @property
+    def hands(self):
+        # MediaPipe loads hundreds of MB of native libraries, so it is only
+        # imported once the first frame needs tracking. Both landmarkers are
+        # built then, so switching hand counts never reloads the model.
+        if self._landmarkers is None:
+            self.load_mediapipe()
+            self._landmarkers = {1: self.create_hands(1), 2: self.create_hands(2)}
+        return self._landmarkers[self.num_hands]
+    
+    def load_mediapipe(self):
+        # Quieten MediaPipe's native logging, which slows startup on Windows
+        os.environ.setdefault('GLOG_minloglevel', '2')
+        os.environ.setdefault('TF_CPP_MIN_LOG_LEVEL', '3')
+        
+        import mediapipe as mp
+        from mediapipe.framework.formats import landmark_pb2
+        
+        self.mp = mp
+        self.landmark_pb2 = landmark_pb2
+        self.mp_hands = mp.solutions.hands
+        self.mp_drawing = mp.solutions.drawing_utils
+    
+    def create_hands(self, num_hands):
+        BaseOptions = self.mp.tasks.BaseOptions
+        vision = self.mp.tasks.vision
+        
+        # LIVE_STREAM runs inference inside MediaPipe and reports back through
+        # on_result, so detect_async() never blocks the main loop.
+        options = vision.HandLandmarkerOptions(
+            base_options=BaseOptions(
+                model_asset_path=self.model_path,
+                delegate=BaseOptions.Delegate.CPU
+            ),
+            running_mode=vision.RunningMode.LIVE_STREAM,
+            num_hands=num_hands,
+            min_hand_detection_confidence=0.8,
+            min_hand_presence_confidence=0.5,
+            min_tracking_confidence=0.5,
+            result_callback=self.on_result
+        )
+        return vision.HandLandmarker.create_from_options(options)
+    
+    def on_result(self, result, output_image, timestamp_ms):
+        # Called from a MediaPipe thread. Copy the landmarks of every hand
+        # into one array in a single pass; everything downstream indexes it
+        all_pts = np.array(
+            [[(lm.x, lm.y) for lm in hand] for hand in result.hand_landmarks],
+            dtype=np.float32
+        ).reshape(-1, 21, 2)
+        
+        centroid = all_pts[0].mean(axis=0) if len(all_pts) else None
+        
+        with self._result_lock:
+            # Both landmarkers report here, so a late result from one must
+            # not replace a newer one from the other
+            if timestamp_ms < self._last_result_time:
+                return
+            self._last_result = all_pts
+            self._last_result_time = timestamp_ms
+            if centroid is not None and self._last_centroid is not None:
+                self._hand_motion = float(np.linalg.norm(centroid - self._last_centroid))
+            else:
+                self._hand_motion = 0.0
+            self._last_centroid = centroid
+    
+    def clear_result(self):
+        # Forget the last landmarks so no gesture is replayed from them
+        with self._result_lock:
+            self._last_result = np.zeros((0, 21, 2), dtype=np.float32)
+            self._last_centroid = None
+            self._hand_motion = 0.0
+    
+    def update_hand_count(self, all_ext):
+        # Both two hand gestures start with an open palm, so only look for a
+        # second hand once one is shown, and stop after it has been gone a while
+        hand_count = len(all_ext)
+        now = time.time()
+        num_hands = self.num_hands
+        
+        if hand_count == 2 or (hand_count == 1 and all_ext[0].all()):
+            self._two_hand_window = now
+            num_hands = 2
+        elif now - self._two_hand_window > self.TWO_HAND_TIMEOUT:
+            num_hands = 1
+        
+        # Both landmarkers already exist, so switching is just picking the other one
+        if num_hands == 2 and self.num_hands == 1:
+            self._two_hand_switch_time = self._last_timestamp
+        self.num_hands = num_hands
+    
     def create_tray_icon(self):
+        try:
+            self.run_tray_icon()
+        except Exception as e:
+            # Without a tray, closing the window quits the app instead
+            print(f"System tray unavailable: {e}")
+    
+    def run_tray_icon(self):
+        pystray, Image, ImageDraw = load_tray_modules()
+        
         # Create an icon for the system tray
-        icon_image = self.create_icon_image()
+        icon_image = self.create_icon_image(Image, ImageDraw)
         
         # Create a menu
         menu = (
             pystray.MenuItem('Show Window', self.show_window),
+            pystray.MenuItem('Hide Window', self.hide_window),
             pystray.MenuItem('Pause/Resume', self.toggle_pause),
             pystray.MenuItem('Exit', self.exit_app)
         )
@@ -68,8 +446,9 @@ class GestureControlApp:
         # Create the tray icon
         self.icon = pystray.Icon("gesture_control", icon_image, "Gesture Control", menu)
         self.icon.run_detached()
+        self._tray_ready = True
     
-    def create_icon_image(self):
+    def create_icon_image(self, Image, ImageDraw):
         # Create a simple icon (a colored square)
         width = 64
         height = 64
@@ -84,13 +463,37 @@ class GestureControlApp:
         return image
     
     def show_window(self, icon, item):
-        # This will be called when "Show Window" is clicked
-        # We will just make sure the OpenCV window is focused
-        pass
+        # This will be called when "Show Window" is clicked. HighGUI calls
+        # have to stay on the main thread, which reopens the window on its
+        # next frame
+        self._window_visible = True
+    
+    def hide_window(self, icon, item):
+        # The main thread closes the window and stops drawing
+        self._window_visible = False
+    
+    def update_window(self):
+        # Closing the window hides it to the tray instead of bringing it back
+        # next frame. With no tray to control the app from, it quits instead.
+        if self._window_open and cv2.getWindowProperty(self.WINDOW_NAME, cv2.WND_PROP_VISIBLE) < 1:
+            self._window_open = False
+            if self._tray_ready:
+                self._window_visible = False
+            else:
+                self.running = False
+        
+        if self._window_open and not self._window_visible:
+            cv2.destroyWindow(self.WINDOW_NAME)
+            self._window_open = False
+    
+    def show_image(self, image):
+        cv2.imshow(self.WINDOW_NAME, image)
+        self._window_open = True
     
     def toggle_pause(self, icon, item):
         # Toggle pause state
         self.paused = not self.paused
+        self.clear_result()
         if self.paused:
             self.status_message = "PAUSED - Press P to resume"
         else:
@@ -102,85 +505,203 @@ class GestureControlApp:
         if hasattr(icon, 'stop'):
             icon.stop()
     
+    def raise_priority(self):
+        # Keep other desktop work from preempting capture and tracking
+        if not HAS_PSUTIL:
+            return
+        process = psutil.Process()
+        try:
+            if sys.platform == 'win32':
+                process.nice(psutil.HIGH_PRIORITY_CLASS)
+            else:
+                process.nice(-5)
+        except psutil.AccessDenied:
+            # Raising priority needs extra rights on some systems
+            pass
+    
     def start(self):
+        # OpenCV only does small resizes and flips here; its own thread pool
+        # would just compete with MediaPipe for cores
+        cv2.setNumThreads(1)
+        self.raise_priority()
+        
         # Initialize video capture
         self.cam = cv2.VideoCapture(0)
-        
+        # Ask for MJPEG so the camera compresses frames and USB bandwidth isn't the limit
+        self.cam.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+        self.cam.set(cv2.CAP_PROP_FRAME_WIDTH, self.CAMERA_WIDTH)
+        self.cam.set(cv2.CAP_PROP_FRAME_HEIGHT, self.CAMERA_HEIGHT)
+        self.cam.set(cv2.CAP_PROP_FPS, self.CAMERA_FPS)
+        # Keep only the newest frame in the driver queue
+        self.cam.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        self.running = True
+        self._last_frame_time = time.monotonic()
+
+        # Grab frames on a separate thread so inference never waits on the camera
+        self.capture = CaptureThread(self.cam)
+        self.capture.start()
+
         # Start the system tray if available
         if HAS_TRAY:
             threading.Thread(target=self.create_tray_icon, daemon=True).start()
         
-        self.running = True
         try:
+            # Compile the gesture classifiers while the camera warms up
+            compile_gesture_kernels()
             self.main_loop()
         finally:
             self.cleanup()
     
     def main_loop(self):
         while self.running and self.cam.isOpened():
-            # Process key presses
-            key = cv2.waitKey(1) & 0xFF
-            if key == ord('q'):
+            self.update_window()
+            if not self.running:
                 break
-            elif key == ord('p'):
-                self.toggle_pause(None, None)
+            
+            # Process key presses; while hidden the tray menu is the only control
+            if self._window_open:
+                key = cv2.waitKey(1) & 0xFF
+                if key == ord('q'):
+                    break
+                elif key == ord('p'):
+                    self.toggle_pause(None, None)
             
             # Skip processing if paused
             if self.paused:
                 # Just show a paused message
-                black_screen = 255 * np.ones((400, 600, 3), dtype=np.uint8)
-                cv2.putText(black_screen, "PAUSED", (200, 200), cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 0, 255), 3)
-                cv2.putText(black_screen, "Press 'P' to resume", (150, 250), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-                cv2.imshow('Gesture Control', black_screen)
+                if self._window_visible:
+                    self.show_image(self._paused_img)
                 time.sleep(0.1)  # Reduce CPU usage while paused
+                self._last_frame_time = time.monotonic()
                 continue
             
-            # Capture frame
-            success, image = self.cam.read()
+            # Take the newest frame from the capture thread, mirrored for a
+            # selfie-view display into the buffer reused from the last frame
+            success, image = self.capture.read(self._frame_buf, timeout=0.1)
             if not success:
-                print("Failed to capture image")
-                time.sleep(0.5)  # Wait a bit before trying again
+                # Report a stalled camera once instead of freezing silently
+                stalled = time.monotonic() - self._last_frame_time
+                if stalled > self.CAPTURE_TIMEOUT and not self._capture_failed:
+                    print("Failed to capture image")
+                    self._capture_failed = True
                 continue
+            self._frame_buf = image
+            self._last_frame_time = time.monotonic()
+            if self._capture_failed:
+                print("Camera capture resumed")
+                self._capture_failed = False
+
+            # On skipped frames the previous landmarks are reused
+            if self.should_track():
+                self.track(image)
 
-            # Process the frame
+            # Process the frame with the newest landmarks available
             self.process_frame(image)
     
+    def should_track(self):
+        # Track every other frame while the hand holds still, and every frame
+        # when no hand is tracked yet or it is moving
+        if self._frame_idx % 2 == 0:
+            return True
+        with self._result_lock:
+            return len(self._last_result) == 0 or self._hand_motion > self.MOTION_THRESHOLD
+    
+    def track(self, image):
+        # Track on a small copy; landmarks are normalized so they still
+        # line up with the full size frame used for display. The copy goes
+        # into one reused buffer, and mp.Image copies the pixels, so the
+        # buffer is free again once detect_async returns.
+        width, height = self.INFERENCE_SIZE
+        if self._small_buf is None or self._small_buf.shape != (height, width, 3):
+            self._small_buf = np.empty((height, width, 3), dtype=np.uint8)
+        cv2.resize(image, self.INFERENCE_SIZE, dst=self._small_buf, interpolation=cv2.INTER_AREA)
+
+        # Convert BGR to RGB in place, so no second buffer is needed
+        image_rgb = cv2.cvtColor(self._small_buf, cv2.COLOR_BGR2RGB, dst=self._small_buf)
+
+        # While tracking one hand, look for a second one every few frames;
+        # the hand kept may be the pointing hand of a two hand gesture
+        hands = self.hands
+        self._track_count += 1
+        if self.num_hands == 1 and self._track_count % self.TWO_HAND_PROBE_INTERVAL == 0:
+            hands = self._landmarkers[2]
+        
+        # Queue the image for tracking; the result arrives later in on_result
+        hands.detect_async(
+            self.mp.Image(image_format=self.mp.ImageFormat.SRGB, data=image_rgb),
+            self.next_timestamp()
+        )
+    
+    def next_timestamp(self):
+        # LIVE_STREAM requires strictly increasing timestamps
+        timestamp_ms = int(time.monotonic() * 1000)
+        if timestamp_ms <= self._last_timestamp:
+            timestamp_ms = self._last_timestamp + 1
+        self._last_timestamp = timestamp_ms
+        return timestamp_ms
+
     def process_frame(self, image):
-        # Flip the image horizontally for a later selfie-view display
-        image = cv2.flip(image, 1)
-        
-        frame_height, frame_width = image.shape[:2]
-        
-        # Draw guide lines
-        cv2.line(image, (0, frame_height//2 - 20), (frame_width, frame_height//2 - 20), (0, 255, 0), 2)
-        cv2.line(image, (frame_width//2, frame_height), (frame_width//2, 0), (0, 255, 0), 2)
+        # Only act on a recent result. An old one, e.g. from before a pause,
+        # would replay a stale gesture.
+        # Timestamps come from next_timestamp(), so they share its clock.
+        with self._result_lock:
+            all_pts = self._last_result
+            result_time = self._last_result_time
+        if time.monotonic() - result_time / 1000 > self.RESULT_MAX_AGE:
+            all_pts = all_pts[:0]
+        
+        # Which fingers of each hand are extended, as a (hands, 5) boolean matrix
+        all_ext = all_pts[:, self.TIPS, 1] < all_pts[:, self.PIPS, 1]
+        self.update_hand_count(all_ext)
+        
+        # An open palm switches to two hands; until the two hand landmarker
+        # has reported, it is the start of a two hand gesture, not a click
+        self._switching_hands = self.num_hands == 2 and result_time <= self._two_hand_switch_time
         
-        # Convert BGR to RGB
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        
-        # Process the image
-        results = self.hands.process(image_rgb)
-
         # Reset mode message
         self.mode_message = "No hands detected"
         
-        # Process hand landmarks
-        if results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
-                # Extract landmarks
-                self.extract_landmarks(hand_landmarks)
-                
-                # Process single hand gestures
-                if len(results.multi_hand_landmarks) == 1:
-                    self.mode_message = "One hand"
-                    self.process_single_hand(hand_landmarks, image)
-                # Process two hand gestures
-                elif len(results.multi_hand_landmarks) == 2:
-                    self.mode_message = "Two hands"
-                    self.process_two_hands(results.multi_hand_landmarks, image)
-                
-                # Draw hand landmarks
-                self.mp_drawing.draw_landmarks(image, hand_landmarks, self.mp_hands.HAND_CONNECTIONS)
+        # Start cursor smoothing afresh once the pointing hand is back
+        if len(all_ext) != 1:
+            self._cursor_ema = None
+        
+        # Process single hand gestures
+        if len(all_ext) == 1:
+            self.mode_message = "One hand"
+            self.process_single_hand(all_pts[0], image)
+        # Process two hand gestures (once per frame, not once per hand)
+        elif len(all_ext) == 2:
+            self.mode_message = "Two hands"
+            self.process_two_hands(all_pts, image)
+        
+        # Gestures are handled every frame, but drawing can wait a frame
+        # and is skipped entirely while the window is hidden
+        self._frame_idx += 1
+        if not self._window_visible:
+            return
+        if self._frame_idx % 2 == 0 or self.status_message != self._last_status:
+            self._last_status = self.status_message
+            self.render(image, all_pts)
+    
+    def render(self, image, all_pts):
+        frame_height, frame_width = image.shape[:2]
+        
+        # Draw guide lines by copying the overlay's line pixels over the frame
+        if self._overlay is None or self._overlay.shape != image.shape:
+            self._overlay = np.zeros_like(image)
+            cv2.line(self._overlay, (0, frame_height//2 - 20), (frame_width, frame_height//2 - 20), (0, 255, 0), 2)
+            cv2.line(self._overlay, (frame_width//2, frame_height), (frame_width//2, 0), (0, 255, 0), 2)
+            self._overlay_mask = self._overlay.any(axis=2, keepdims=True)
+        np.copyto(image, self._overlay, where=self._overlay_mask)
+        
+        # Draw hand landmarks; draw_landmarks needs them as a landmark list
+        for pts in all_pts:
+            hand_landmarks = self.landmark_pb2.NormalizedLandmarkList()
+            hand_landmarks.landmark.extend(
+                self.landmark_pb2.NormalizedLandmark(x=float(x), y=float(y)) for x, y in pts
+            )
+            self.mp_drawing.draw_landmarks(image, hand_landmarks, self.mp_hands.HAND_CONNECTIONS)
         
         # Add status messages
         cv2.putText(image, self.status_message, (10, frame_height - 20), 
@@ -193,117 +714,78 @@ class GestureControlApp:
                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
         
         # Display the resulting frame
-        cv2.imshow('Gesture Control', image)
-    
-    def extract_landmarks(self, hand_landmarks):
-        # Extract finger landmarks
-        self.thumb_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.THUMB_TIP]
-        self.thumb_ip = hand_landmarks.landmark[self.mp_hands.HandLandmark.THUMB_IP]
-        self.index_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP]
-        self.index_pip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_PIP]
-        self.middle_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP]
-        self.middle_pip = hand_landmarks.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_PIP]
-        self.ring_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.RING_FINGER_TIP]
-        self.ring_pip = hand_landmarks.landmark[self.mp_hands.HandLandmark.RING_FINGER_PIP]
-        self.little_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.PINKY_TIP]
-        self.little_pip = hand_landmarks.landmark[self.mp_hands.HandLandmark.PINKY_PIP]
-        
-        # Check finger states
-        self.thumb_extended = self.thumb_tip.y < self.thumb_ip.y
-        self.index_extended = self.index_tip.y < self.index_pip.y
-        self.middle_extended = self.middle_tip.y < self.middle_pip.y
-        self.ring_extended = self.ring_tip.y < self.ring_pip.y
-        self.little_extended = self.little_tip.y < self.little_pip.y
-        
-        # Calculate distance for pinch detection
-        self.thumb_tip_x = self.thumb_tip.x
-        self.thumb_tip_y = self.thumb_tip.y
-        self.middle_tip_x = self.middle_tip.x
-        self.middle_tip_y = self.middle_tip.y
-        self.distance = ((self.thumb_tip_x - self.middle_tip_x)**2 + (self.thumb_tip_y - self.middle_tip_y)**2)**0.5
-    
-    def process_single_hand(self, hand_landmarks, image):
-        # Mouse control with index finger
-        if self.index_extended and not (self.middle_extended or self.ring_extended or self.little_extended):
-            cursor_x = int(self.index_tip.x * self.screen_width)
-            cursor_y = int(self.index_tip.y * self.screen_height + 30)
-            pyautogui.moveTo(cursor_x, cursor_y, duration=0.1, tween=pyautogui.easeOutQuad)
-            self.status_message = "Mouse Control"
+        self.show_image(image)
+    
+    def process_single_hand(self, pts, image):
+        gesture, param = classify_one_hand(pts)
         
-        # Vertical scrolling with index and middle fingers
-        elif self.index_extended and self.middle_extended and not (self.ring_extended or self.little_extended):
-            hand_y = (self.index_tip.y + self.middle_tip.y) / 2
-            
-            if hand_y > 0.5:
-                pyautogui.scroll(-self.SCROLL_SPEED)
-                self.status_message = "Scrolling Down"
-            else: 
-                pyautogui.scroll(self.SCROLL_SPEED) 
-                self.status_message = "Scrolling Up"
-        
-        # Horizontal scrolling with index and little fingers
-        elif self.index_extended and self.little_extended and not (self.middle_extended or self.ring_extended):
-            hand_x = (self.index_tip.x + self.little_tip.x) / 2
+        # Mouse control with index finger
+        if gesture == GESTURE_MOUSE:
+            cursor = np.array([pts[INDEX_FINGER_TIP, 0] * self.screen_width,
+                               pts[INDEX_FINGER_TIP, 1] * self.screen_height + 30])
             
-            if hand_x > 0.5:
-                pyautogui.hscroll(self.SCROLL_SPEED)
-                self.status_message = "Scrolling Right"
+            # Smooth with a moving average and jump straight there, instead of
+            # an eased move that blocks for 0.1 s every frame
+            if self._cursor_ema is None:
+                self._cursor_ema = cursor
             else:
-                pyautogui.hscroll(-self.SCROLL_SPEED)
-                self.status_message = "Scrolling Left"
+                self._cursor_ema = self.CURSOR_SMOOTHING * self._cursor_ema + (1 - self.CURSOR_SMOOTHING) * cursor
+            pyautogui.moveTo(int(self._cursor_ema[0]), int(self._cursor_ema[1]))
+            self.status_message = "Mouse Control"
+        
+        # Scrolling, limited to one step per cooldown instead of one per frame
+        elif gesture in (GESTURE_SCROLL_VERTICAL, GESTURE_SCROLL_HORIZONTAL):
+            current_time = time.time()
+            if current_time - self._last_scroll_time >= self.SCROLL_COOLDOWN:
+                # Vertical scrolling with index and middle fingers
+                if gesture == GESTURE_SCROLL_VERTICAL:
+                    if param > 0.5:
+                        pyautogui.scroll(-self.SCROLL_SPEED)
+                        self.status_message = "Scrolling Down"
+                    else: 
+                        pyautogui.scroll(self.SCROLL_SPEED) 
+                        self.status_message = "Scrolling Up"
+                
+                # Horizontal scrolling with index and little fingers
+                else:
+                    if param > 0.5:
+                        pyautogui.hscroll(self.SCROLL_SPEED)
+                        self.status_message = "Scrolling Right"
+                    else:
+                        pyautogui.hscroll(-self.SCROLL_SPEED)
+                        self.status_message = "Scrolling Left"
+                self._last_scroll_time = current_time
         
         # Left click with open hand
-        elif all([self.thumb_extended, self.index_extended, self.middle_extended, self.ring_extended, self.little_extended]):
+        elif gesture == GESTURE_LEFT_CLICK:
             current_time = time.time()
-            if current_time - self.last_click_time >= self.CLICK_COOLDOWN:
+            if self._switching_hands:
+                self.status_message = "Looking for second hand"
+            elif current_time - self.last_click_time >= self.CLICK_COOLDOWN:
                 pyautogui.click()
                 self.last_click_time = current_time
                 self.status_message = "Left Click"
         
         # Right click with pinch gesture
-        elif self.distance < 0.05:  # Thumb and middle finger pinch
+        elif gesture == GESTURE_RIGHT_CLICK:
             current_time = time.time()
             if current_time - self.last_click_time >= self.CLICK_COOLDOWN:
                 pyautogui.click(button="right")
                 self.last_click_time = current_time
                 self.status_message = "Right Click"
     
-    def process_two_hands(self, multi_hand_landmarks, image):
-        hand1 = multi_hand_landmarks[0]
-        hand2 = multi_hand_landmarks[1]
-        
-        # Check if first hand is open (all fingers extended)
-        hand1_all_extended = all([
-            hand1.landmark[self.mp_hands.HandLandmark.THUMB_TIP].y < hand1.landmark[self.mp_hands.HandLandmark.THUMB_IP].y,
-            hand1.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP].y < hand1.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_PIP].y,
-            hand1.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP].y < hand1.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_PIP].y,
-            hand1.landmark[self.mp_hands.HandLandmark.RING_FINGER_TIP].y < hand1.landmark[self.mp_hands.HandLandmark.RING_FINGER_PIP].y,
-            hand1.landmark[self.mp_hands.HandLandmark.PINKY_TIP].y < hand1.landmark[self.mp_hands.HandLandmark.PINKY_PIP].y
-        ])
-        
-        # Check if second hand has only index extended
-        hand2_index_only = (
-            hand2.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP].y < hand2.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_PIP].y
-            and hand2.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP].y > hand2.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_PIP].y
-            and hand2.landmark[self.mp_hands.HandLandmark.RING_FINGER_TIP].y > hand2.landmark[self.mp_hands.HandLandmark.RING_FINGER_PIP].y
-            and hand2.landmark[self.mp_hands.HandLandmark.PINKY_TIP].y > hand2.landmark[self.mp_hands.HandLandmark.PINKY_PIP].y
-        )
-
-        # Check if second hand has index and middle fingers extended
-        hand2_index_middle = (
-                        hand2.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP].y < hand2.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_PIP].y
-                        and hand2.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP].y < hand2.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_PIP].y
-                        and hand2.landmark[self.mp_hands.HandLandmark.RING_FINGER_TIP].y > hand2.landmark[self.mp_hands.HandLandmark.RING_FINGER_PIP].y
-                        and hand2.landmark[self.mp_hands.HandLandmark.PINKY_TIP].y > hand2.landmark[self.mp_hands.HandLandmark.PINKY_PIP].y
-                    )
+    def process_two_hands(self, all_pts, image):
+        hand1 = all_pts[0]
+        hand2 = all_pts[1]
+        gesture, param = classify_two_hands(hand1, hand2)
         
         # Text selection - Open palm and index finger pointing
-        if hand1_all_extended and hand2_index_only:
+        if gesture == GESTURE_SELECT:
             # If selection hasn't started yet, start it
             if not self.selection_active:
                 # Start position is the index finger of the hand with all fingers extended
-                start_x = int(hand1.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP].x * self.screen_width)
-                start_y = int(hand1.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP].y * self.screen_height)
+                start_x = int(hand1[INDEX_FINGER_TIP, 0] * self.screen_width)
+                start_y = int(hand1[INDEX_FINGER_TIP, 1] * self.screen_height)
                 
                 # Move to start position and press mouse button
                 pyautogui.moveTo(start_x, start_y)
@@ -313,8 +795,8 @@ class GestureControlApp:
                 self.status_message = "Text Selection Started"
             
             # Continue selection by moving to the current position of the pointing finger
-            end_x = int(hand2.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP].x * self.screen_width)
-            end_y = int(hand2.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP].y * self.screen_height)
+            end_x = int(hand2[INDEX_FINGER_TIP, 0] * self.screen_width)
+            end_y = int(hand2[INDEX_FINGER_TIP, 1] * self.screen_height)
             
             pyautogui.moveTo(end_x, end_y)
             self.status_message = "Text Selection Active"
@@ -326,31 +808,31 @@ class GestureControlApp:
             self.status_message = "Text Selection Completed"
         
         # Zoom functionality - open hand and peace sign
-        elif hand1_all_extended and hand2_index_middle:
-            fingers_y = (hand2.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP].y + 
-                        hand2.landmark[self.mp_hands.HandLandmark.MIDDLE_FINGER_TIP].y) / 2
-    
-            ZOOM_FACTOR = 1  # Adjust as needed
-            
-            if fingers_y < 0.5:  # Upper half of screen
-                # Zoom in - Ctrl and + key
-                pyautogui.keyDown('ctrl')
-                pyautogui.press('+')
-                pyautogui.keyUp('ctrl')
-                self.status_message = "Zoom In"
-            else:  # Lower half
-                # Zoom out - Ctrl and - key
-                pyautogui.keyDown('ctrl')
-                pyautogui.press('-')
-                pyautogui.keyUp('ctrl')
-                self.status_message = "Zoom Out"
+        elif gesture == GESTURE_ZOOM:
+            # Limit to one zoom step per cooldown instead of one per frame
+            current_time = time.time()
+            if current_time - self._last_zoom_time >= self.ZOOM_COOLDOWN:
+                if param < 0.5:  # Upper half of screen
+                    # Zoom in - Ctrl and + key
+                    pyautogui.hotkey('ctrl', '+')
+                    self.status_message = "Zoom In"
+                else:  # Lower half
+                    # Zoom out - Ctrl and - key
+                    pyautogui.hotkey('ctrl', '-')
+                    self.status_message = "Zoom Out"
+                self._last_zoom_time = current_time
     
     def cleanup(self):
         # Release resources
+        self.running = False
+        if hasattr(self, 'capture'):
+            self.capture.stop()
+            self.capture.join(timeout=1.0)
         if hasattr(self, 'cam'):
             self.cam.release()
-        if hasattr(self, 'hands'):
-            self.hands.close()
+        if self._landmarkers is not None:
+            for landmarker in self._landmarkers.values():
+                landmarker.close()
         cv2.destroyAllWindows()
         
         # If the selection was active, make sure to release the mouse button
@@ -358,13 +840,35 @@ class GestureControlApp:
             pyautogui.mouseUp()
             self.selection_active = False
 
+def ensure_hand_model(model_path):
+    # The hand landmarker model isn't part of the mediapipe package
+    if os.path.exists(model_path):
+        return True
+    
+    print("Hand landmarker model not found. Downloading...")
+    # Download to a temporary file first so an interrupted download never
+    # leaves a truncated model behind
+    tmp_path = model_path + '.part'
+    try:
+        with urllib.request.urlopen(HAND_MODEL_URL, timeout=30) as response, open(tmp_path, 'wb') as f:
+            shutil.copyfileobj(response, f)
+        os.replace(tmp_path, model_path)
+    except OSError as e:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        print(f"Could not download the hand landmarker model: {e}")
+        print(f"Download it from {HAND_MODEL_URL} and save it as {model_path}")
+        return False
+    return True
+
 def resource_path(relative_path):
     """ Get absolute path to resource, works for dev and for PyInstaller """
     try:
         # PyInstaller creates a temp folder and stores path in _MEIPASS
         base_path = sys._MEIPASS
     except Exception:
-        base_path = os.path.abspath(".")
+        # Running from source: resolve next to this script, not the cwd
+        base_path = os.path.dirname(os.path.abspath(__file__))
     
     return os.path.join(base_path, relative_path)
 
@@ -6,7 +6,6 @@ This script launches the gesture control application
 
 import sys
 import os
-from gesture_control_app import main
 
 if __name__ == "__main__":
     # Ensure working directory is set correctly
@@ -14,5 +13,9 @@ if __name__ == "__main__":
         # Running as executable
         os.chdir(os.path.dirname(sys.executable))
     
+    # Import only after the working directory is set, so nothing heavy
+    # loads before it
+    from gesture_control_app import main
+    
     # Start the application
     main()
\ No newline at end of file